@@ -3,25 +3,72 @@ CropToken Flask API Server
 A comprehensive REST API for interacting with the CropToken smart contract using Flask and Web3.py
 
 Installation requirements:
-pip install flask web3 python-dotenv flask-cors
+pip install flask web3 python-dotenv flask-cors cachetools aiohttp pycryptodome gunicorn orjson pybloom-live
+
+Running:
+gunicorn -c gunicorn.conf.py blockchain:app    (production, from pyScripts/)
+python blockchain.py                           (development server)
 
 Environment variables needed (.env file):
 RPC_URL=http://localhost:8545
 PRIVATE_KEY=your_private_key_here
 CONTRACT_ADDRESS=your_deployed_contract_address_here
+
+Optional environment variables:
+MULTICALL3_ADDRESS=0xcA11bde05977b3631167028862bE2a173976CA11
+MULTICALL_BATCH_SIZE=200
+DEPLOY_BLOCK=0
+CACHE_MAXSIZE=100000
+OWNER_CACHE_TTL=5
+NEXT_ID_CACHE_TTL=5
+RPC_POOL_CONNECTIONS=32
+RPC_POOL_MAXSIZE=128
+RPC_TIMEOUT=30
+RECEIPT_POLL_LATENCY=1.0
+RECEIPT_TIMEOUT=120
+SEND_RAW_TX_SYNC=auto
+INDEXER_ENABLED=true
+INDEXER_POLL_INTERVAL=2
+INDEXER_BLOCK_RANGE=5000
+INDEXER_STALE_AFTER=6
+REGISTRATION_BLOOM_ENABLED=false
+REGISTRATION_BLOOM_CAPACITY=100000
+REGISTRATION_BLOOM_ERROR_RATE=0.001
+ETH_HASH_BACKEND=pycryptodome
 """
 
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Use the native pycryptodome Keccak for address checksums and ABI
+# encoding unless the environment or .env picks another backend.
+# eth_hash resolves the backend on first use, so set it before any hashing
+os.environ.setdefault("ETH_HASH_BACKEND", "pycryptodome")
+
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from web3 import Web3
+from web3.datastructures import AttributeDict
+from eth_account import Account
+from eth_abi import decode as abi_decode, encode as abi_encode
+from hexbytes import HexBytes
+from cachetools import LRUCache, TTLCache
+from pybloom_live import ScalableBloomFilter
+import requests
+from requests.adapters import HTTPAdapter
+import aiohttp
+import asyncio
+import orjson
 import json
-import os
-from dotenv import load_dotenv
+import threading
+import time
 import logging
 from datetime import datetime
-from functools import wraps
+from functools import wraps, lru_cache
 
-load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -30,120 +77,231 @@ import web3
 logger.info(f"Web3.py version: {web3.__version__}")
 
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for jsonify() and request.get_json()"""
+    
+    # Flask sorts keys by default; keep the response shape unchanged
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, (bytes, bytearray)):
+            return Web3.to_hex(obj)
+        if isinstance(obj, AttributeDict):
+            return dict(obj)
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _dumps_bytes(self, obj):
+        try:
+            return orjson.dumps(obj, default=self._default, option=self.options)
+        except orjson.JSONEncodeError:
+            # orjson rejects integers outside 64 bits, e.g. a uint256 crop
+            # ID echoed from the URL; the stdlib encoder handles any size
+            return json.dumps(
+                obj, default=self._default, sort_keys=True,
+                ensure_ascii=False, separators=(",", ":")
+            ).encode()
+    
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._dumps_bytes(obj),
+            mimetype="application/json"
+        )
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  
 
+@lru_cache(maxsize=None)
+def load_abi(filename):
+    """Load a contract ABI from a JSON file next to this module"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), filename), "rb") as f:
+        return orjson.loads(f.read())
+
 # Configuration
 class Config:
     RPC_URL = os.getenv("RPC_URL", "http://localhost:8545")
+    RPC_POOL_CONNECTIONS = int(os.getenv("RPC_POOL_CONNECTIONS", 32))
+    RPC_POOL_MAXSIZE = int(os.getenv("RPC_POOL_MAXSIZE", 128))
+    RPC_TIMEOUT = int(os.getenv("RPC_TIMEOUT", 30))
+    
+    # Receipt polling; block times are seconds, so polling every 100ms
+    # (the web3.py default) mostly returns "not yet mined"
+    RECEIPT_POLL_LATENCY = float(os.getenv("RECEIPT_POLL_LATENCY", 1.0))
+    RECEIPT_TIMEOUT = int(os.getenv("RECEIPT_TIMEOUT", 120))
+    
+    # eth_sendRawTransactionSync: "auto" probes the node at startup,
+    # "true"/"false" force it on or off
+    SEND_RAW_TX_SYNC = os.getenv("SEND_RAW_TX_SYNC", "auto").lower()
+    
     PRIVATE_KEY = os.getenv("PRIVATE_KEY")
     CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS")
     
-    # Contract ABI 
-    CONTRACT_ABI = [
-        {
-            "inputs": [],
-            "name": "nextId",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function"
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "name": "crops",
-            "outputs": [
-                {"internalType": "uint256", "name": "id", "type": "uint256"},
-                {"internalType": "string", "name": "metadata", "type": "string"},
-                {"internalType": "address", "name": "owner", "type": "address"}
-            ],
-            "stateMutability": "view",
-            "type": "function"
-        },
-        {
-            "inputs": [{"internalType": "address", "name": "", "type": "address"}],
-            "name": "registeredUsers",
-            "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-            "stateMutability": "view",
-            "type": "function"
-        },
-        {
-            "inputs": [],
-            "name": "registerUser",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function"
-        },
-        {
-            "inputs": [{"internalType": "string", "name": "_metadata", "type": "string"}],
-            "name": "createCrop",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function"
-        },
-        {
-            "inputs": [
-                {"internalType": "uint256", "name": "_id", "type": "uint256"},
-                {"internalType": "address", "name": "_owner", "type": "address"}
-            ],
-            "name": "authenticate",
-            "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-            "stateMutability": "view",
-            "type": "function"
-        },
+    # Multicall3 is deployed at the same address on most EVM chains
+    MULTICALL3_ADDRESS = os.getenv("MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+    MULTICALL_BATCH_SIZE = int(os.getenv("MULTICALL_BATCH_SIZE", 200))
+    
+    # Block the contract was deployed at; event scans start here
+    DEPLOY_BLOCK = int(os.getenv("DEPLOY_BLOCK", 0))
+    
+    # Background event indexer for ownership lookups
+    INDEXER_ENABLED = os.getenv("INDEXER_ENABLED", "true").lower() == "true"
+    INDEXER_POLL_INTERVAL = float(os.getenv("INDEXER_POLL_INTERVAL", 2))
+    INDEXER_BLOCK_RANGE = int(os.getenv("INDEXER_BLOCK_RANGE", 5000))
+    # Stop serving from the index when it last reached the head longer ago
+    INDEXER_STALE_AFTER = float(os.getenv("INDEXER_STALE_AFTER", 3 * INDEXER_POLL_INTERVAL))
+    
+    # Bloom filter of registered users fed by the indexer; grows past
+    # the initial capacity while keeping the false positive rate.
+    # Opt-in: its "not registered" answers lag registrations made
+    # elsewhere (other workers, direct contract calls)
+    REGISTRATION_BLOOM_ENABLED = os.getenv("REGISTRATION_BLOOM_ENABLED", "false").lower() == "true"
+    REGISTRATION_BLOOM_CAPACITY = int(os.getenv("REGISTRATION_BLOOM_CAPACITY", 100_000))
+    REGISTRATION_BLOOM_ERROR_RATE = float(os.getenv("REGISTRATION_BLOOM_ERROR_RATE", 0.001))
+    
+    # In-process caches for contract reads
+    CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", 100_000))
+    OWNER_CACHE_TTL = int(os.getenv("OWNER_CACHE_TTL", 5))
+    NEXT_ID_CACHE_TTL = float(os.getenv("NEXT_ID_CACHE_TTL", 5))
+    
+    # Contract ABI (see crop_token.abi.json)
+    CONTRACT_ABI = load_abi("crop_token.abi.json")
+    
+    # Multicall3 ABI (aggregate3 only)
+    MULTICALL3_ABI = [
         {
             "inputs": [
-                {"internalType": "uint256", "name": "_id", "type": "uint256"},
-                {"internalType": "address", "name": "_to", "type": "address"}
+                {
+                    "components": [
+                        {"internalType": "address", "name": "target", "type": "address"},
+                        {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                        {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                    ],
+                    "internalType": "struct Multicall3.Call3[]",
+                    "name": "calls",
+                    "type": "tuple[]"
+                }
             ],
-            "name": "transferCrop",
-            "outputs": [],
-            "stateMutability": "nonpayable",
-            "type": "function"
-        },
-        {
-            "inputs": [{"internalType": "uint256", "name": "_id", "type": "uint256"}],
-            "name": "getCrop",
+            "name": "aggregate3",
             "outputs": [
-                {"internalType": "uint256", "name": "", "type": "uint256"},
-                {"internalType": "string", "name": "", "type": "string"},
-                {"internalType": "address", "name": "", "type": "address"}
+                {
+                    "components": [
+                        {"internalType": "bool", "name": "success", "type": "bool"},
+                        {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                    ],
+                    "internalType": "struct Multicall3.Result[]",
+                    "name": "returnData",
+                    "type": "tuple[]"
+                }
             ],
-            "stateMutability": "view",
+            "stateMutability": "payable",
             "type": "function"
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {"indexed": False, "internalType": "uint256", "name": "id", "type": "uint256"},
-                {"indexed": False, "internalType": "string", "name": "metadata", "type": "string"},
-                {"indexed": False, "internalType": "address", "name": "owner", "type": "address"}
-            ],
-            "name": "CropCreated",
-            "type": "event"
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {"indexed": False, "internalType": "uint256", "name": "id", "type": "uint256"},
-                {"indexed": False, "internalType": "address", "name": "from", "type": "address"},
-                {"indexed": False, "internalType": "address", "name": "to", "type": "address"}
-            ],
-            "name": "CropTransferred",
-            "type": "event"
-        },
-        {
-            "anonymous": False,
-            "inputs": [
-                {"indexed": False, "internalType": "address", "name": "user", "type": "address"}
-            ],
-            "name": "UserRegistered",
-            "type": "event"
         }
     ]
 
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Crop id/metadata never change once minted and registration only goes
+# false -> true, so those are cached indefinitely. Owners change on
+# transfer and are only cached briefly.
+crop_metadata_cache = LRUCache(maxsize=Config.CACHE_MAXSIZE)
+crop_owner_cache = TTLCache(maxsize=Config.CACHE_MAXSIZE, ttl=Config.OWNER_CACHE_TTL)
+registration_cache = LRUCache(maxsize=Config.CACHE_MAXSIZE)
+cache_lock = threading.Lock()
+
+# nextId() only grows, mostly through our own createCrop calls
+_next_id_cache = {"value": None, "expires": 0}
+
+def _detect_raw_tx_attr():
+    """
+    Find which attribute holds the raw bytes of a signed transaction; the
+    name differs between eth-account/web3.py versions. Signs a throwaway
+    transaction once at startup.
+    """
+    signed_tx = Account.sign_transaction(
+        {"nonce": 0, "gasPrice": 0, "gas": 21000, "to": ZERO_ADDRESS, "value": 0, "chainId": 1},
+        "0x" + "11" * 32
+    )
+    for attr in ("raw_transaction", "rawTransaction", "raw"):
+        if hasattr(signed_tx, attr):
+            logger.info(f"Using '{attr}' attribute for signed transactions")
+            return attr
+    logger.error(f"Could not find raw transaction attribute. Available: {[attr for attr in dir(signed_tx) if not attr.startswith('_')]}")
+    return None
+
+RAW_TX_ATTR = _detect_raw_tx_attr()
+
+# Precomputed selectors and ABI types for reads made over raw JSON-RPC:
+# name -> (4-byte selector, input types, output types)
+CONTRACT_READS = {
+    "getCrop": (Web3.keccak(text="getCrop(uint256)")[:4], ["uint256"], ["uint256", "string", "address"]),
+    "registeredUsers": (Web3.keccak(text="registeredUsers(address)")[:4], ["address"], ["bool"]),
+    "nextId": (Web3.keccak(text="nextId()")[:4], [], ["uint256"]),
+    "authenticate": (Web3.keccak(text="authenticate(uint256,address)")[:4], ["uint256", "address"], ["bool"])
+}
+AGGREGATE3_SELECTOR = Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+# Event topics used for log scans
+CROP_CREATED_TOPIC = Web3.to_hex(Web3.keccak(text="CropCreated(uint256,string,address)"))
+CROP_CREATED_TYPES = ["uint256", "string", "address"]
+CROP_TRANSFERRED_TOPIC = Web3.to_hex(Web3.keccak(text="CropTransferred(uint256,address,address)"))
+CROP_TRANSFERRED_TYPES = ["uint256", "address", "address"]
+USER_REGISTERED_TOPIC = Web3.to_hex(Web3.keccak(text="UserRegistered(address)"))
+USER_REGISTERED_TYPES = ["address"]
+
+# Shared keep-alive session for all RPC traffic. The requests default pool
+# holds 10 connections, which concurrent workers exhaust quickly.
+rpc_session = requests.Session()
+rpc_adapter = HTTPAdapter(
+    pool_connections=Config.RPC_POOL_CONNECTIONS,
+    pool_maxsize=Config.RPC_POOL_MAXSIZE,
+    max_retries=3
+)
+rpc_session.mount("http://", rpc_adapter)
+rpc_session.mount("https://", rpc_adapter)
+rpc_session.headers.update({"Connection": "keep-alive"})
+
+def _rpc_method_unsupported(error):
+    """Tell from a JSON-RPC error whether the node rejected the method itself"""
+    if error.get("code") in (-32601, -32600):
+        return True
+    message = str(error.get("message", "")).lower()
+    return any(hint in message for hint in (
+        "not found", "not supported", "unsupported", "does not exist", "unknown", "not available"
+    ))
+
+def _rpc_method_supported(response):
+    """
+    Tell from a probe with an invalid payload whether the node implements
+    the method. Only an invalid-params or decoding error counts as support;
+    anything else (rate limits, proxies, unrecognized errors) does not.
+    """
+    error = response.get("error")
+    if not error:
+        return True
+    if _rpc_method_unsupported(error):
+        return False
+    if error.get("code") == -32602:
+        return True
+    message = str(error.get("message", "")).lower()
+    return any(hint in message for hint in ("rlp", "decode", "invalid transaction", "invalid params", "too short"))
+
 # Initialize Web3
 try:
-    w3 = Web3(Web3.HTTPProvider(Config.RPC_URL))
+    w3 = Web3(Web3.HTTPProvider(
+        Config.RPC_URL,
+        session=rpc_session,
+        request_kwargs={"timeout": Config.RPC_TIMEOUT}
+    ))
     if not w3.is_connected():
         raise Exception("Failed to connect to blockchain")
     
@@ -153,6 +311,28 @@ try:
         abi=Config.CONTRACT_ABI
     )
     
+    # Initialize Multicall3 if it is deployed on this chain
+    multicall_address = Web3.to_checksum_address(Config.MULTICALL3_ADDRESS)
+    if w3.eth.get_code(multicall_address):
+        multicall = w3.eth.contract(address=multicall_address, abi=Config.MULTICALL3_ABI)
+    else:
+        multicall = None
+        logger.warning(f"Multicall3 not found at {multicall_address}, falling back to JSON-RPC batches")
+    
+    # Probe once for eth_sendRawTransactionSync; an invalid-params error
+    # for the empty payload means the method exists
+    if Config.SEND_RAW_TX_SYNC == "auto":
+        try:
+            send_raw_tx_sync = _rpc_method_supported(
+                w3.provider.make_request("eth_sendRawTransactionSync", ["0x"])
+            )
+        except Exception as e:
+            logger.warning(f"eth_sendRawTransactionSync probe failed, using send + poll: {e}")
+            send_raw_tx_sync = False
+    else:
+        send_raw_tx_sync = Config.SEND_RAW_TX_SYNC == "true"
+    logger.info(f"eth_sendRawTransactionSync enabled: {send_raw_tx_sync}")
+    
     # Initialize account
     if Config.PRIVATE_KEY:
         account = w3.eth.account.from_key(Config.PRIVATE_KEY)
@@ -165,62 +345,257 @@ try:
 except Exception as e:
     logger.error(f"Failed to initialize Web3: {e}")
     contract = None
+    multicall = None
+    send_raw_tx_sync = False
     default_address = None
 
 # Utility functions
 def validate_address(address):
     """Validate Ethereum address format"""
+    if not isinstance(address, str):
+        return False
+    return _checksum_address(address)
+
+@lru_cache(maxsize=10_000)
+def _checksum_address(address):
+    """Checksum an address once; the same addresses recur across requests"""
     try:
         return Web3.is_address(address) and Web3.to_checksum_address(address)
     except:
         return False
 
-def handle_transaction(tx_function, *args, **kwargs):
-    """Handle transaction execution with proper error handling"""
+def send_raw_transaction_sync(raw_transaction):
+    """
+    Submit a signed transaction with eth_sendRawTransactionSync, which
+    returns the receipt once mined. Returns (tx_hash, receipt).
+    If the node or the HTTP request times out first, the transaction has
+    already been broadcast, so poll for its receipt instead of failing.
+    If the node turns out not to support the method, nothing was sent:
+    disable the sync path and send with eth_sendRawTransaction instead.
+    """
+    global send_raw_tx_sync
+    tx_hash = Web3.keccak(raw_transaction)
+    body = orjson.dumps({
+        "jsonrpc": "2.0", "id": 1, "method": "eth_sendRawTransactionSync",
+        "params": [Web3.to_hex(raw_transaction), Config.RECEIPT_TIMEOUT * 1000]
+    })
+    try:
+        # The node holds the request for up to RECEIPT_TIMEOUT
+        response = rpc_session.post(
+            Config.RPC_URL, data=body, headers=JSON_HEADERS, timeout=Config.RECEIPT_TIMEOUT + 5
+        )
+        response.raise_for_status()
+        reply = orjson.loads(response.content)
+    except requests.exceptions.ReadTimeout:
+        logger.warning(f"eth_sendRawTransactionSync timed out, polling for {tx_hash.hex()}")
+        return tx_hash, wait_for_receipt(tx_hash)
+    
+    if "result" not in reply:
+        error = reply.get("error") or {}
+        message = str(error.get("message", "")).lower()
+        # EIP-7966 reports a transaction that was not mined in time as code 4
+        if error.get("code") == 4 or "timeout" in message or "timed out" in message:
+            logger.warning(f"Node timed out waiting for {tx_hash.hex()}, polling for the receipt")
+            return tx_hash, wait_for_receipt(tx_hash)
+        if _rpc_method_unsupported(error):
+            logger.warning(f"eth_sendRawTransactionSync not supported ({error}), switching to send + poll")
+            send_raw_tx_sync = False
+            tx_hash = w3.eth.send_raw_transaction(raw_transaction)
+            return tx_hash, wait_for_receipt(tx_hash)
+        raise RuntimeError(f"eth_sendRawTransactionSync failed: {error or 'no response'}")
+    
+    receipt = reply["result"]
+    # The node's raw receipt is not run through web3.py's formatters
+    receipt = AttributeDict({
+        **receipt,
+        "transactionHash": HexBytes(receipt["transactionHash"]),
+        "blockNumber": int(receipt["blockNumber"], 16),
+        "gasUsed": int(receipt["gasUsed"], 16)
+    })
+    return receipt.transactionHash, receipt
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def rpc(method, params):
+    """
+    Call a single JSON-RPC method directly over the pooled session,
+    skipping web3.py's middleware and result formatting.
+    Returns the raw result; raises if the node returns an error.
+    """
+    body = orjson.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+    response = rpc_session.post(Config.RPC_URL, data=body, headers=JSON_HEADERS, timeout=Config.RPC_TIMEOUT)
+    response.raise_for_status()
+    reply = orjson.loads(response.content)
+    if "result" not in reply:
+        raise RuntimeError(f"{method} failed: {reply.get('error', 'no response')}")
+    return reply["result"]
+
+def rpc_batch_replies(calls):
+    """
+    Send several JSON-RPC calls in one HTTP request.
+    `calls` is a list of (method, params); each call's raw reply dict is
+    returned in the same order ({} if the node left it out), so callers
+    can tell which call failed. Raises if the batch itself is rejected.
+    """
+    body = orjson.dumps([
+        {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+        for index, (method, params) in enumerate(calls)
+    ])
+    response = rpc_session.post(Config.RPC_URL, data=body, headers=JSON_HEADERS, timeout=Config.RPC_TIMEOUT)
+    response.raise_for_status()
+    replies = orjson.loads(response.content)
+    if not isinstance(replies, list):
+        raise RuntimeError(f"JSON-RPC batch rejected: {replies.get('error', replies)}")
+    
+    replies = {reply.get("id"): reply for reply in replies}
+    return [replies.get(index, {}) for index in range(len(calls))]
+
+def encode_read(name, args):
+    """Encode calldata for a CropToken read from its precomputed selector"""
+    selector, input_types, _ = CONTRACT_READS[name]
+    return selector + abi_encode(input_types, args)
+
+def decode_read(name, return_data):
+    """Decode the return data of a CropToken read"""
+    return abi_decode(CONTRACT_READS[name][2], return_data)
+
+def call_read(name, args, sender=None):
+    """Run a CropToken read as a raw eth_call and decode the result"""
+    tx = {"to": contract.address, "data": Web3.to_hex(encode_read(name, args))}
+    if sender:
+        tx["from"] = sender
+    return decode_read(name, Web3.to_bytes(hexstr=rpc("eth_call", [tx, "latest"])))
+
+def encode_aggregate3(calls):
+    """Encode Multicall3 aggregate3 calldata for (target, allow_failure, calldata) calls"""
+    return AGGREGATE3_SELECTOR + abi_encode(["(address,bool,bytes)[]"], [calls])
+
+def decode_aggregate3(return_data):
+    """Decode aggregate3 return data into (success, return_data) pairs"""
+    (returned,) = abi_decode(["(bool,bytes)[]"], return_data)
+    return returned
+
+class ReadFailed(RuntimeError):
+    """A contract read in a prefetch batch failed; `name` is the read's function"""
+    
+    def __init__(self, name, error):
+        super().__init__(f"{name} failed: {error}")
+        self.name = name
+
+def prefetch_transaction_inputs(*reads):
+    """
+    Run contract reads together with the sender nonce and chain ID in one
+    JSON-RPC batch, so a write pays a single round trip before signing.
+    With Multicall3 available, several reads are packed into one
+    aggregate3 eth_call.
+    Each read is (function name, args).
+    Returns (decoded reads, nonce, chain_id); nonce and chain_id are None
+    when no sender account is configured. A failed read raises ReadFailed
+    naming it; a failed aggregate3 call is reported against the first read.
+    """
+    aggregated = multicall is not None and len(reads) > 1
+    if aggregated:
+        calldata = encode_aggregate3([
+            (contract.address, True, encode_read(name, args)) for name, args in reads
+        ])
+        calls = [("eth_call", [{"to": multicall.address, "data": Web3.to_hex(calldata)}, "latest"])]
+    else:
+        calls = [
+            ("eth_call", [{"to": contract.address, "data": Web3.to_hex(encode_read(name, args))}, "latest"])
+            for name, args in reads
+        ]
+    if default_address:
+        calls += [
+            ("eth_getTransactionCount", [default_address, "latest"]),
+            ("eth_chainId", [])
+        ]
+    
+    replies = rpc_batch_replies(calls)
+    if aggregated:
+        results = _read_result(reads[0][0], replies[0])
+        decoded = []
+        for (name, _), (success, return_data) in zip(reads, decode_aggregate3(Web3.to_bytes(hexstr=results))):
+            if not success:
+                raise ReadFailed(name, "call reverted")
+            decoded.append(_decode_prefetched(name, return_data))
+    else:
+        decoded = [
+            _decode_prefetched(name, Web3.to_bytes(hexstr=_read_result(name, reply)))
+            for (name, _), reply in zip(reads, replies)
+        ]
+    if not default_address:
+        return decoded, None, None
+    
+    nonce, chain_id = [
+        int(_read_result(method, reply), 16)
+        for (method, _), reply in zip(calls[-2:], replies[-2:])
+    ]
+    return decoded, nonce, chain_id
+
+def _read_result(name, reply):
+    if "result" not in reply:
+        raise ReadFailed(name, reply.get("error", "no response"))
+    return reply["result"]
+
+def _decode_prefetched(name, return_data):
+    try:
+        return decode_read(name, return_data)
+    except Exception as e:
+        raise ReadFailed(name, e)
+
+def wait_for_receipt(tx_hash):
+    """Poll for a transaction receipt every RECEIPT_POLL_LATENCY seconds"""
+    return w3.eth.wait_for_transaction_receipt(
+        tx_hash,
+        timeout=Config.RECEIPT_TIMEOUT,
+        poll_latency=Config.RECEIPT_POLL_LATENCY
+    )
+
+def handle_transaction(tx_function, *args, prefetched_nonce=None, prefetched_chain_id=None, **kwargs):
+    """
+    Handle transaction execution with proper error handling.
+    Pass prefetched_nonce/prefetched_chain_id (see prefetch_transaction_inputs)
+    to skip fetching them here.
+    Returns (result, status_code, tx_receipt); tx_receipt is None on failure.
+    """
     try:
         if not Config.PRIVATE_KEY:
-            return {"error": "Private key not configured"}, 400
+            return {"error": "Private key not configured"}, 400, None
         
         logger.info(f"Building transaction for function: {tx_function}")
         
         # Build transaction
-        tx = tx_function(*args, **kwargs)
-        tx_dict = tx.build_transaction({
+        if prefetched_nonce is None:
+            prefetched_nonce = w3.eth.get_transaction_count(default_address)
+        tx_params = {
             'from': default_address,
             'gas': 3000000,
             'gasPrice': w3.to_wei('20', 'gwei'),
-            'nonce': w3.eth.get_transaction_count(default_address)
-        })
+            'nonce': prefetched_nonce
+        }
+        if prefetched_chain_id is not None:
+            tx_params['chainId'] = prefetched_chain_id
         
-        logger.info(f"Transaction dict built: {tx_dict}")
+        tx = tx_function(*args, **kwargs)
+        tx_dict = tx.build_transaction(tx_params)
         
         # Sign transaction
+        if RAW_TX_ATTR is None:
+            return {"error": "Could not access raw transaction data"}, 500, None
         signed_tx = w3.eth.account.sign_transaction(tx_dict, Config.PRIVATE_KEY)
-        logger.info(f"Transaction signed. Type: {type(signed_tx)}")
-        logger.info(f"Signed transaction attributes: {dir(signed_tx)}")
+        raw_transaction = getattr(signed_tx, RAW_TX_ATTR)
         
-        # Try different attribute names for Web3.py version compatibility
-        raw_transaction = None
-        if hasattr(signed_tx, 'rawTransaction'):
-            raw_transaction = signed_tx.rawTransaction
-            logger.info("Using 'rawTransaction' attribute")
-        elif hasattr(signed_tx, 'raw_transaction'):
-            raw_transaction = signed_tx.raw_transaction
-            logger.info("Using 'raw_transaction' attribute")
-        elif hasattr(signed_tx, 'raw'):
-            raw_transaction = signed_tx.raw
-            logger.info("Using 'raw' attribute")
+        if send_raw_tx_sync:
+            # Send and wait for confirmation in a single RPC
+            tx_hash, tx_receipt = send_raw_transaction_sync(raw_transaction)
+            logger.info(f"Transaction sent. Hash: {tx_hash.hex()}")
         else:
-            # Fallback: try to get the raw transaction data
-            logger.error(f"Could not find raw transaction attribute. Available: {[attr for attr in dir(signed_tx) if not attr.startswith('_')]}")
-            return {"error": "Could not access raw transaction data"}, 500
-        
-        # Send transaction
-        tx_hash = w3.eth.send_raw_transaction(raw_transaction)
-        logger.info(f"Transaction sent. Hash: {tx_hash.hex()}")
-        
-        # Wait for confirmation
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            # Send transaction
+            tx_hash = w3.eth.send_raw_transaction(raw_transaction)
+            logger.info(f"Transaction sent. Hash: {tx_hash.hex()}")
+            
+            # Wait for confirmation
+            tx_receipt = wait_for_receipt(tx_hash)
         logger.info(f"Transaction confirmed. Block: {tx_receipt.blockNumber}")
         
         return {
@@ -228,14 +603,358 @@ def handle_transaction(tx_function, *args, **kwargs):
             "tx_hash": tx_hash.hex(),
             "gas_used": tx_receipt.gasUsed,
             "block_number": tx_receipt.blockNumber
-        }, 200
+        }, 200, tx_receipt
         
     except Exception as e:
         logger.error(f"Transaction failed: {e}")
         logger.error(f"Exception type: {type(e)}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return {"error": str(e)}, 500
+        return {"error": str(e)}, 500, None
+
+def is_user_registered(address):
+    """Check registeredUsers(address), caching positive results"""
+    key = address.lower()
+    with cache_lock:
+        if key in registration_cache:
+            return True
+    if known_unregistered(address):
+        return False
+    
+    (is_registered,) = call_read("registeredUsers", [address])
+    if is_registered:
+        with cache_lock:
+            registration_cache[key] = True
+    return is_registered
+
+def get_crop_data(crop_id):
+    """Fetch getCrop(crop_id), serving cached metadata and recent owners"""
+    with cache_lock:
+        metadata = crop_metadata_cache.get(crop_id)
+        owner = crop_owner_cache.get(crop_id)
+    if metadata is not None and owner is not None:
+        return [crop_id, metadata, owner]
+    
+    returned_id, metadata, owner = call_read("getCrop", [crop_id])
+    crop_data = [returned_id, metadata, Web3.to_checksum_address(owner)]
+    # Unminted ids read as zero values and may be minted later
+    if crop_data[2] != ZERO_ADDRESS:
+        with cache_lock:
+            crop_metadata_cache[crop_id] = crop_data[1]
+            crop_owner_cache[crop_id] = crop_data[2]
+    return crop_data
+
+def cached_next_id():
+    """Return nextId(), reusing the last value for NEXT_ID_CACHE_TTL seconds"""
+    with cache_lock:
+        if _next_id_cache["value"] is not None and time.monotonic() < _next_id_cache["expires"]:
+            return _next_id_cache["value"]
+    
+    (next_id,) = call_read("nextId", [])
+    with cache_lock:
+        _next_id_cache["value"] = next_id
+        _next_id_cache["expires"] = time.monotonic() + Config.NEXT_ID_CACHE_TTL
+    return next_id
+
+def _note_crop_created(crop_id):
+    """Advance the cached nextId() past a crop we just created"""
+    with cache_lock:
+        if _next_id_cache["value"] is not None:
+            _next_id_cache["value"] = max(_next_id_cache["value"], crop_id + 1)
+
+def _get_crop_or_none(crop_id):
+    """Fetch a single crop, returning None if the call fails"""
+    try:
+        crop_id, metadata, owner = call_read("getCrop", [crop_id])
+        return [crop_id, metadata, Web3.to_checksum_address(owner)]
+    except Exception:
+        return None
+
+def _eth_call_payload(request_id, to, data):
+    """Build a raw JSON-RPC eth_call request object"""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "eth_call",
+        "params": [{"to": to, "data": data}, "latest"]
+    }
+
+def _decode_crop(return_data):
+    """Decode getCrop return data, returning None if it cannot be decoded"""
+    try:
+        crop_id, metadata, owner = decode_read("getCrop", return_data)
+    except Exception:
+        return None
+    return [crop_id, metadata, Web3.to_checksum_address(owner)]
+
+async def _post_json_rpc(session, body):
+    """POST a JSON-RPC request (or batch) to the node"""
+    async with session.post(Config.RPC_URL, json=body) as response:
+        response.raise_for_status()
+        return await response.json(content_type=None)
+
+async def _fetch_crop_batch(session, batch):
+    """Read one batch of crops in a single HTTP request"""
+    if multicall is not None:
+        # One aggregate3 eth_call for the whole batch
+        calls = [(contract.address, True, encode_read("getCrop", [crop_id])) for crop_id in batch]
+        reply = await _post_json_rpc(session, _eth_call_payload(
+            1, multicall.address, Web3.to_hex(encode_aggregate3(calls))
+        ))
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        returned = decode_aggregate3(Web3.to_bytes(hexstr=reply["result"]))
+        return [_decode_crop(return_data) if success else None for success, return_data in returned]
+    
+    # No Multicall3: one JSON-RPC batch of getCrop eth_calls
+    replies = await _post_json_rpc(session, [
+        _eth_call_payload(index, contract.address, Web3.to_hex(encode_read("getCrop", [crop_id])))
+        for index, crop_id in enumerate(batch)
+    ])
+    if not isinstance(replies, list):
+        raise RuntimeError(replies.get("error", replies))
+    results = {reply.get("id"): reply.get("result") for reply in replies}
+    return [
+        _decode_crop(Web3.to_bytes(hexstr=results[index])) if results.get(index) else None
+        for index in range(len(batch))
+    ]
+
+async def _fetch_crop_batches(batches):
+    """Read all batches concurrently over one pooled aiohttp session"""
+    connector = aiohttp.TCPConnector(limit=Config.RPC_POOL_MAXSIZE)
+    timeout = aiohttp.ClientTimeout(total=Config.RPC_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(
+            *(_fetch_crop_batch(session, batch) for batch in batches),
+            return_exceptions=True
+        )
+
+def fetch_crops(crop_ids):
+    """
+    Fetch getCrop results for many crop IDs.
+    IDs are split into MULTICALL_BATCH_SIZE batches that are sent
+    concurrently, each as one Multicall3 aggregate3 call (or one JSON-RPC
+    batch without Multicall3). A failed crop read yields None in its slot.
+    """
+    batches = [
+        crop_ids[start:start + Config.MULTICALL_BATCH_SIZE]
+        for start in range(0, len(crop_ids), Config.MULTICALL_BATCH_SIZE)
+    ]
+    
+    results = []
+    for batch, fetched in zip(batches, asyncio.run(_fetch_crop_batches(batches))):
+        if isinstance(fetched, Exception):
+            logger.warning(f"Crop batch read failed, falling back to per-call reads: {fetched}")
+            results.extend(_get_crop_or_none(crop_id) for crop_id in batch)
+        else:
+            results.extend(fetched)
+    return results
+
+def crop_id_from_receipt(tx_receipt):
+    """
+    Read the assigned crop ID from the CropCreated log of a createCrop receipt.
+    Works on both web3-formatted and raw (eth_sendRawTransactionSync) receipts.
+    """
+    for log in tx_receipt["logs"]:
+        if log["address"].lower() != contract.address.lower():
+            continue
+        if log["topics"] and HexBytes(log["topics"][0]) == HexBytes(CROP_CREATED_TOPIC):
+            crop_id, _, _ = abi_decode(CROP_CREATED_TYPES, HexBytes(log["data"]))
+            return crop_id
+    return None
+
+def fetch_contract_logs(from_block, to_block, topics):
+    """Fetch raw CropToken logs matching any of the given event topics"""
+    logs = rpc("eth_getLogs", [{
+        "address": contract.address,
+        "fromBlock": Web3.to_hex(from_block),
+        "toBlock": to_block if isinstance(to_block, str) else Web3.to_hex(to_block),
+        "topics": [topics]
+    }])
+    return sorted(logs, key=lambda log: (_quantity(log["blockNumber"]), _quantity(log["logIndex"])))
+
+def _quantity(value):
+    """Read a JSON-RPC quantity that may be raw hex or already an int"""
+    return value if isinstance(value, int) else int(value, 16)
+
+class CropIndex:
+    """In-memory crop ownership index built from CropCreated/CropTransferred logs"""
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.owner_to_ids = {}    # lowercase owner (as eth_abi decodes it) -> set of crop IDs
+        self.crop_meta = {}       # crop ID -> (metadata, checksummed owner)
+        self.crop_position = {}   # crop ID -> (block, log index) of the last applied log
+    
+    def apply_logs(self, logs):
+        """
+        Fold CropToken logs (raw or web3-formatted) into the index.
+        Logs older than what a crop already reflects are ignored, so the
+        same log may be applied more than once and in any order.
+        """
+        with self.lock:
+            for log in logs:
+                if not log["topics"]:
+                    continue
+                topic = Web3.to_hex(HexBytes(log["topics"][0]))
+                data = HexBytes(log["data"])
+                position = (_quantity(log["blockNumber"]), _quantity(log["logIndex"]))
+                if topic == CROP_CREATED_TOPIC:
+                    crop_id, metadata, owner = abi_decode(CROP_CREATED_TYPES, data)
+                    self._set_owner(crop_id, metadata, owner, position)
+                elif topic == CROP_TRANSFERRED_TOPIC:
+                    crop_id, _, to = abi_decode(CROP_TRANSFERRED_TYPES, data)
+                    if crop_id in self.crop_meta:
+                        self._set_owner(crop_id, self.crop_meta[crop_id][0], to, position)
+                elif topic == USER_REGISTERED_TOPIC:
+                    (user,) = abi_decode(USER_REGISTERED_TYPES, data)
+                    self._note_registered(user)
+    
+    def _note_registered(self, user):
+        with cache_lock:
+            registration_cache[user.lower()] = True
+    
+    def apply_receipt(self, tx_receipt):
+        """Index the CropToken logs of one of our own transactions right away"""
+        self.apply_logs([
+            log for log in tx_receipt["logs"]
+            if log["address"].lower() == contract.address.lower()
+        ])
+    
+    def _set_owner(self, crop_id, metadata, owner, position):
+        if self.crop_position.get(crop_id, (-1, -1)) >= position:
+            return
+        if crop_id in self.crop_meta:
+            self.owner_to_ids[self.crop_meta[crop_id][1].lower()].discard(crop_id)
+        self.crop_meta[crop_id] = (metadata, Web3.to_checksum_address(owner))
+        self.crop_position[crop_id] = position
+        self.owner_to_ids.setdefault(owner, set()).add(crop_id)
+    
+    def owned_by(self, address, limit):
+        """Return up to `limit` crops owned by address, lowest ID first"""
+        with self.lock:
+            crop_ids = sorted(self.owner_to_ids.get(address.lower(), ()))[:limit]
+            return [
+                {"id": crop_id, "metadata": self.crop_meta[crop_id][0], "owner": self.crop_meta[crop_id][1]}
+                for crop_id in crop_ids
+            ]
+
+class CropIndexer(CropIndex):
+    """
+    CropIndex kept current by a daemon thread that polls for new logs.
+    Replays from DEPLOY_BLOCK on startup in INDEXER_BLOCK_RANGE chunks.
+    """
+    
+    TOPICS = [CROP_CREATED_TOPIC, CROP_TRANSFERRED_TOPIC, USER_REGISTERED_TOPIC]
+    
+    def __init__(self):
+        super().__init__()
+        self.last_block = Config.DEPLOY_BLOCK - 1
+        self.synced = False
+        self.synced_at = 0.0    # time.monotonic() when the index last reached the head
+        self.registered_users = ScalableBloomFilter(
+            initial_capacity=Config.REGISTRATION_BLOOM_CAPACITY,
+            error_rate=Config.REGISTRATION_BLOOM_ERROR_RATE
+        )
+    
+    def _note_registered(self, user):
+        super()._note_registered(user)
+        with self.lock:
+            self.registered_users.add(user.lower())
+    
+    def may_be_registered(self, address):
+        """False only if no UserRegistered log for address has been indexed"""
+        with self.lock:
+            return address.lower() in self.registered_users
+    
+    def start(self):
+        thread = threading.Thread(target=self._run, name="crop-indexer", daemon=True)
+        thread.start()
+    
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"Crop indexer sync failed: {e}")
+                self.synced = False
+                time.sleep(Config.INDEXER_POLL_INTERVAL)
+                continue
+            # Keep replaying without pausing until caught up with the head
+            if self.synced:
+                time.sleep(Config.INDEXER_POLL_INTERVAL)
+    
+    def sync(self):
+        """Index the next range of blocks up to the chain head"""
+        latest = int(rpc("eth_blockNumber", []), 16)
+        if latest <= self.last_block:
+            self.synced = True
+            self.synced_at = time.monotonic()
+            return
+        
+        to_block = min(latest, self.last_block + Config.INDEXER_BLOCK_RANGE)
+        self.apply_logs(fetch_contract_logs(self.last_block + 1, to_block, self.TOPICS))
+        self.last_block = to_block
+        if not self.synced and to_block == latest:
+            logger.info(f"Crop indexer caught up at block {latest}")
+        self.synced = to_block == latest
+        if self.synced:
+            self.synced_at = time.monotonic()
+    
+    def is_current(self):
+        """True if the index reached the chain head within INDEXER_STALE_AFTER seconds"""
+        return self.synced and time.monotonic() - self.synced_at <= Config.INDEXER_STALE_AFTER
+
+def known_unregistered(address):
+    """
+    True when REGISTRATION_BLOOM_ENABLED is set and a current indexer has
+    never seen address register, so registeredUsers(address) is false
+    without an RPC. The Bloom filter has no false negatives up to the last
+    indexed block; a hit still goes to the contract. Registrations made
+    outside this process show up on the next poll, so write handlers keep
+    checking the contract.
+    """
+    return (
+        Config.REGISTRATION_BLOOM_ENABLED
+        and crop_indexer is not None
+        and crop_indexer.is_current()
+        and not crop_indexer.may_be_registered(address)
+    )
+
+def find_owned_crops_from_logs(address, limit):
+    """
+    Rebuild crop ownership from CropCreated/CropTransferred logs.
+    A single eth_getLogs call covers both events; the node's log
+    Bloom filters skip blocks without matching logs.
+    """
+    index = CropIndex()
+    index.apply_logs(fetch_contract_logs(
+        Config.DEPLOY_BLOCK, "latest", [CROP_CREATED_TOPIC, CROP_TRANSFERRED_TOPIC]
+    ))
+    return index.owned_by(address, limit)
+
+def find_owned_crops_by_scan(address, limit):
+    """Find owned crops by reading every crop up to the limit"""
+    next_id = cached_next_id()
+    owned_crops = []
+    # Fetched owners are checksummed, so normalize the query address once
+    target = _checksum_address(address)
+    
+    for crop_data in fetch_crops(list(range(min(next_id, limit)))):
+        if crop_data and crop_data[2] == target:
+            owned_crops.append({
+                "id": crop_data[0],
+                "metadata": crop_data[1],
+                "owner": crop_data[2]
+            })
+    return owned_crops
+
+# Start the ownership indexer
+if contract is not None and Config.INDEXER_ENABLED:
+    crop_indexer = CropIndexer()
+    crop_indexer.start()
+else:
+    crop_indexer = None
 
 # API Routes
 
@@ -286,16 +1005,25 @@ def register_user():
     if not validate_address(user_address):
         return jsonify({"error": "Invalid address format"}), 400
     
-    # Check if already registered
+    # Check if already registered, fetching the nonce in the same batch
     try:
-        is_registered = contract.functions.registeredUsers(user_address).call()
+        ((is_registered,),), nonce, chain_id = prefetch_transaction_inputs(
+            ("registeredUsers", [user_address])
+        )
         if is_registered:
             return jsonify({"error": "User already registered"}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to check registration status: {e}"}), 500
     
     # Register user
-    result, status_code = handle_transaction(contract.functions.registerUser)
+    result, status_code, tx_receipt = handle_transaction(
+        contract.functions.registerUser,
+        prefetched_nonce=nonce,
+        prefetched_chain_id=chain_id
+    )
+    
+    if status_code == 200 and crop_indexer is not None:
+        crop_indexer.apply_receipt(tx_receipt)
     
     if status_code == 200:
         result["user_address"] = user_address
@@ -311,6 +1039,10 @@ def check_user_registration(address):
     Parameters:
     - address: Ethereum address to check
     
+    With REGISTRATION_BLOOM_ENABLED=true, "is_registered": false can be
+    stale for up to INDEXER_STALE_AFTER seconds after a registration made
+    by another worker or directly on-chain.
+    
     Returns:
     {
         "address": "0x...",
@@ -321,7 +1053,7 @@ def check_user_registration(address):
         return jsonify({"error": "Invalid address format"}), 400
     
     try:
-        is_registered = contract.functions.registeredUsers(address).call()
+        is_registered = is_user_registered(address)
         return jsonify({
             "address": address,
             "is_registered": is_registered
@@ -365,29 +1097,35 @@ def create_crop():
     if not validate_address(owner_address):
         return jsonify({"error": "Invalid owner address format"}), 400
     
-    # Check if user is registered
+    # Check registration, fetching the nonce in the same batch
     try:
-        is_registered = contract.functions.registeredUsers(owner_address).call()
+        ((is_registered,),), nonce, chain_id = prefetch_transaction_inputs(
+            ("registeredUsers", [owner_address])
+        )
         if not is_registered:
             return jsonify({"error": "User must be registered first"}), 400
     except Exception as e:
         return jsonify({"error": f"Failed to check registration: {e}"}), 500
     
-    # Get next crop ID before creating
-    try:
-        next_id = contract.functions.nextId().call()
-    except Exception as e:
-        return jsonify({"error": f"Failed to get next ID: {e}"}), 500
-    
     # Create crop
-    result, status_code = handle_transaction(
+    result, status_code, tx_receipt = handle_transaction(
         contract.functions.createCrop,
-        metadata
+        metadata,
+        prefetched_nonce=nonce,
+        prefetched_chain_id=chain_id
     )
     
     if status_code == 200:
+        # The contract assigns the ID; read it back from the CropCreated event
+        crop_id = crop_id_from_receipt(tx_receipt)
+        if crop_id is None:
+            logger.warning(f"No CropCreated event in receipt {result['tx_hash']}")
+        else:
+            _note_crop_created(crop_id)
+        if crop_indexer is not None:
+            crop_indexer.apply_receipt(tx_receipt)
         result.update({
-            "crop_id": next_id,
+            "crop_id": crop_id,
             "metadata": metadata,
             "owner": owner_address
         })
@@ -412,10 +1150,10 @@ def get_crop(crop_id):
     }
     """
     try:
-        crop_data = contract.functions.getCrop(crop_id).call()
+        crop_data = get_crop_data(crop_id)
         
         # Check if crop exists (owner will be zero address if not)
-        exists = crop_data[2] != "0x0000000000000000000000000000000000000000"
+        exists = crop_data[2] != ZERO_ADDRESS
         
         return jsonify({
             "id": crop_data[0],
@@ -453,9 +1191,7 @@ def authenticate_crop(crop_id):
         return jsonify({"error": "Invalid owner address format"}), 400
     
     try:
-        is_authentic = contract.functions.authenticate(crop_id, owner_address).call({
-            'from': default_address
-        })
+        (is_authentic,) = call_read("authenticate", [crop_id, owner_address], sender=default_address)
         
         return jsonify({
             "crop_id": crop_id,
@@ -501,30 +1237,42 @@ def transfer_crop(crop_id):
     if not validate_address(from_address):
         return jsonify({"error": "Invalid sender address format"}), 400
     
-    # Check if recipient is registered
+    # Fetch recipient registration and current owner (one aggregate3 call
+    # when Multicall3 is available) plus the nonce in one batch
     try:
-        is_registered = contract.functions.registeredUsers(to_address).call()
-        if not is_registered:
-            return jsonify({"error": "Recipient must be registered"}), 400
+        ((is_registered,), crop_data), nonce, chain_id = prefetch_transaction_inputs(
+            ("registeredUsers", [to_address]),
+            ("getCrop", [crop_id])
+        )
+    except ReadFailed as e:
+        if e.name == "getCrop":
+            return jsonify({"error": f"Failed to verify ownership: {e}"}), 500
+        return jsonify({"error": f"Failed to check recipient registration: {e}"}), 500
     except Exception as e:
         return jsonify({"error": f"Failed to check recipient registration: {e}"}), 500
     
-    # Verify ownership
-    try:
-        crop_data = contract.functions.getCrop(crop_id).call()
-        if crop_data[2].lower() != from_address.lower():
-            return jsonify({"error": "Only the owner can transfer this crop"}), 403
-    except Exception as e:
-        return jsonify({"error": f"Failed to verify ownership: {e}"}), 500
+    # Check if recipient is registered
+    if not is_registered:
+        return jsonify({"error": "Recipient must be registered"}), 400
+    
+    # Verify ownership (eth_abi decodes addresses as lowercase hex)
+    if crop_data[2] != from_address.lower():
+        return jsonify({"error": "Only the owner can transfer this crop"}), 403
     
     # Transfer crop
-    result, status_code = handle_transaction(
+    result, status_code, tx_receipt = handle_transaction(
         contract.functions.transferCrop,
         crop_id,
-        to_address
+        to_address,
+        prefetched_nonce=nonce,
+        prefetched_chain_id=chain_id
     )
     
     if status_code == 200:
+        with cache_lock:
+            crop_owner_cache[crop_id] = Web3.to_checksum_address(to_address)
+        if crop_indexer is not None:
+            crop_indexer.apply_receipt(tx_receipt)
         result.update({
             "crop_id": crop_id,
             "from_address": from_address,
@@ -545,7 +1293,7 @@ def get_next_crop_id():
     }
     """
     try:
-        next_id = contract.functions.nextId().call()
+        next_id = cached_next_id()
         return jsonify({"next_id": next_id})
     except Exception as e:
         return jsonify({"error": f"Failed to get next ID: {e}"}), 500
@@ -554,8 +1302,9 @@ def get_next_crop_id():
 def get_crops_by_owner(address):
     """
     Get all crops owned by an address
-    Note: This requires iterating through all crops. For large datasets,
-    consider implementing event-based indexing.
+    Served from the background ownership index once it has caught up.
+    Until then ownership is rebuilt from CropCreated/CropTransferred logs,
+    and if the node rejects the log query every crop up to the limit is read.
     
     Parameters:
     - address: Owner's Ethereum address
@@ -580,23 +1329,17 @@ def get_crops_by_owner(address):
     if not validate_address(address):
         return jsonify({"error": "Invalid address format"}), 400
     
-    limit = min(int(request.args.get('limit', 100)), 1000)  # Cap at 1000
+    limit = max(0, min(int(request.args.get('limit', 100)), 1000))  # Cap at 1000
     
     try:
-        next_id = contract.functions.nextId().call()
-        owned_crops = []
-        
-        for crop_id in range(min(next_id, limit)):
+        if crop_indexer is not None and crop_indexer.is_current():
+            owned_crops = crop_indexer.owned_by(address, limit)
+        else:
             try:
-                crop_data = contract.functions.getCrop(crop_id).call()
-                if crop_data[2].lower() == address.lower():
-                    owned_crops.append({
-                        "id": crop_data[0],
-                        "metadata": crop_data[1],
-                        "owner": crop_data[2]
-                    })
-            except:
-                continue  
+                owned_crops = find_owned_crops_from_logs(address, limit)
+            except Exception as e:
+                logger.warning(f"Log scan failed, falling back to reading crops: {e}")
+                owned_crops = find_owned_crops_by_scan(address, limit)
         
         return jsonify({
             "owner": address,
@@ -611,8 +1354,10 @@ if __name__ == '__main__':
     if not Config.CONTRACT_ADDRESS or not Config.PRIVATE_KEY:
         logger.warning("CONTRACT_ADDRESS or PRIVATE_KEY not set. Some functionality may not work.")
     
+    # Development server only; use gunicorn (see gunicorn.conf.py) in production
     app.run(
         host='0.0.0.0',
         port=5000,
-        debug=True
+        debug=os.getenv("FLASK_DEBUG") == "1",
+        threaded=True
     )
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for the CropToken Flask API
+
+Usage (from pyScripts/):
+gunicorn -c gunicorn.conf.py blockchain:app
+
+Every endpoint spends most of its time waiting on the RPC node, so each
+worker serves many requests concurrently. The default gthread workers
+are safe with the asyncio/aiohttp crop fan-out; set
+GUNICORN_WORKER_CLASS=gevent (pip install gevent) to multiplex on
+greenlets instead.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 4))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+# Concurrent requests per worker (threads for gthread, greenlets for gevent)
+threads = int(os.getenv("GUNICORN_THREADS", 32))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 200))
+
+# Writes block until the receipt arrives (RECEIPT_TIMEOUT, default 120s)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 150))
+keepalive = 5